@@ -0,0 +1,113 @@
+"""
+CLS 日志的 protobuf wire 格式编码。
+
+cls.proto 的消息结构固定且很简单，这里直接按 wire 格式拼接字节，
+不构造 Log / Log.Content 消息对象（纯 Python 的 protobuf 实现每个字段都要
+经过反射与校验，是单条日志上报路径上最大的 CPU 开销）。
+输出与 ``Log(...).SerializeToString()`` 逐字节一致。
+
+    message Log {
+      required int64 time = 1;
+      message Content {
+        required string key = 1;
+        required string value = 2;
+      }
+      repeated Content contents = 2;
+    }
+    message LogGroup {
+      repeated Log logs = 1;
+      optional string source = 4;
+      ...
+    }
+    message LogGroupList {
+      repeated LogGroup logGroupList = 1;
+    }
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+# 字段 tag（field_number << 3 | wire_type）
+TAG_LOG_GROUP_LIST = b"\x0a"     # LogGroupList.logGroupList = 1, length-delimited
+TAG_LOGS = b"\x0a"               # LogGroup.logs = 1, length-delimited
+TAG_SOURCE = b"\x22"             # LogGroup.source = 4, length-delimited
+_TAG_TIME = b"\x08"              # Log.time = 1, varint
+_TAG_CONTENTS = b"\x12"          # Log.contents = 2, length-delimited
+_TAG_KEY = b"\x0a"               # Log.Content.key = 1, length-delimited
+_TAG_VALUE = b"\x12"             # Log.Content.value = 2, length-delimited
+
+# 单字节 varint（0~127）预先生成，覆盖绝大多数 key / value 长度
+_SMALL_VARINTS = tuple(bytes((i,)) for i in range(0x80))
+
+_UINT64_MASK = (1 << 64) - 1
+
+# 缓存的字段名数量上限（extra 字段名由调用方决定，避免无界增长）
+_MAX_CACHED_KEYS = 4096
+
+
+def encode_varint(value: int) -> bytes:
+    """protobuf base-128 varint 编码（非负整数）。"""
+    if value < 0x80:
+        return _SMALL_VARINTS[value]
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+class KeyCache(dict):
+    """字段名 → 编码后的 Content.key（含 tag 与长度前缀，已应用字段名映射）。
+
+    日志的字段名集合基本固定，每个字段名只做一次映射与 UTF-8 编码；
+    命中时是一次 C 层的 dict 查找，未命中时由 ``__missing__`` 编码。
+    """
+
+    def __init__(self, map_key: Callable[[str, str], str]):
+        """
+        Args:
+            map_key: 字段名映射，签名同 ``dict.get(key, default)``
+        """
+        super().__init__()
+        self._map_key = map_key
+
+    def __missing__(self, k: str) -> bytes:
+        key = self._map_key(k, k).encode("utf-8")
+        encoded = _TAG_KEY + encode_varint(len(key)) + key
+        if len(self) < _MAX_CACHED_KEYS:
+            self[k] = encoded
+        return encoded
+
+
+def serialize_log(
+    timestamp_us: int,
+    fields: dict[str, str],
+    keys: KeyCache,
+) -> bytes:
+    """将一条日志序列化为带 LogGroup.logs tag 与长度前缀的 Log 字节。
+
+    Args:
+        timestamp_us: Log.time
+        fields:       日志字段，key / value 须为 str
+        keys:         字段名编码缓存
+    """
+    varint = encode_varint
+    small = _SMALL_VARINTS
+    parts = [_TAG_TIME, varint(timestamp_us & _UINT64_MASK)]
+    extend = parts.extend
+
+    for k, v in fields.items():
+        key = keys[k]
+        value = v.encode("utf-8")
+        value_len = len(value)
+        value_len_bytes = small[value_len] if value_len < 0x80 else varint(value_len)
+        content_len = 1 + len(key) + len(value_len_bytes) + value_len
+        extend((
+            _TAG_CONTENTS, varint(content_len),
+            key, _TAG_VALUE, value_len_bytes, value,
+        ))
+
+    body = b"".join(parts)
+    return TAG_LOGS + varint(len(body)) + body
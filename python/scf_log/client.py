@@ -0,0 +1,191 @@
+"""
+CLS 上报客户端。
+
+在腾讯云 SDK 的 LogClient 基础上：
+  - 增加直接上报已序列化字节的接口：producer 在发送线程之外就已经拼好了
+    LogGroupList 的 wire bytes，无需再构造一遍 protobuf 对象交给 put_log_raw 序列化
+  - 复用 HTTP keep-alive 连接池（SDK 默认每次请求都新建连接）
+  - 每次调用只发送一次请求，不走 SDK 内置的重试循环，重试策略统一由 producer 控制
+  - 请求签名复用 HMAC 的密钥状态，不在每次请求时用 SecretKey 重新初始化 HMAC
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import time
+from urllib.parse import quote_plus
+
+import lz4.block
+import requests
+from requests.adapters import HTTPAdapter
+from tencentcloud.log.logclient import CONNECTION_TIME_OUT, LogClient
+from tencentcloud.log.logexception import LogException
+from tencentcloud.log.putlogsresponse import PutLogsResponse
+
+
+class CLSClient(LogClient):
+    """支持上报原始 LogGroupList 字节、复用连接的 LogClient。
+
+    多个发送线程共享同一个 requests.Session，连接池大小与发送线程数一致。
+    """
+
+    def __init__(
+        self,
+        *args,
+        pool_size: int = 10,
+        compress: str = "lz4",
+        **kwargs,
+    ):
+        """
+        Args:
+            pool_size: keep-alive 连接池大小，通常等于并发发送线程数
+            compress:  请求体压缩方式，"lz4" 或 ""（不压缩）
+            其余参数透传给 LogClient
+        """
+        super().__init__(*args, **kwargs)
+        self._compress = compress
+        self._signer = _Signer(self._accessKeyId, self._accessKey, 300)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def put_log_bytes(self, topic_id: str, body: bytes) -> PutLogsResponse:
+        """上报已序列化的 LogGroupList。
+
+        默认与 ``LogClient.put_log_raw`` 的请求格式一致（lz4 压缩 + protobuf），
+        区别在于入参是序列化后的字节而不是 LogGroupList 对象，且失败时不重试。
+
+        Args:
+            topic_id: CLS 日志主题 ID
+            body:     LogGroupList 序列化后的字节
+
+        Raises:
+            LogException: 请求失败
+        """
+        headers = {
+            "Host": self._logHost,
+            "Content-Type": "application/x-protobuf",
+        }
+        if self._compress == "lz4":
+            body = lz4.block.compress(body, store_size=False)
+            headers["x-cls-compress-type"] = "lz4"
+        headers["Content-Length"] = str(len(body))
+        params = {"topic_id": topic_id}
+
+        resp, header = self._send_once(
+            "POST", body, "/structuredlog", params, headers, "binary",
+        )
+        return PutLogsResponse(header, resp)
+
+    def close(self) -> None:
+        """关闭连接池。"""
+        self._session.close()
+
+    def _send_once(self, method, body, resource, params, headers,
+                   response_body_type):
+        """签名并发送一次请求（对应 SDK ``_send`` 去掉内置重试后的逻辑）。"""
+        url = self.http_type + self._endpoint + resource
+        headers = dict(headers)
+        headers["X-Qcloud-User-Id"] = os.getenv("HEADER_USER_ID", "")
+        if self._securityToken:
+            headers["X-Cls-Token"] = self._securityToken
+        headers["Authorization"] = self._signer.sign(
+            method, resource, params, headers,
+        )
+        return self._sendRequest(
+            method, url, params, body, headers, response_body_type,
+        )
+
+    def _getHttpResponse(self, method, url, params, body, headers,
+                         timeout=CONNECTION_TIME_OUT):
+        """覆盖 SDK 实现：通过共享 Session 发送请求以复用连接。"""
+        try:
+            headers["User-Agent"] = self._user_agent
+            r = self._session.request(
+                method, url, params=params, data=body, headers=headers,
+                timeout=timeout,
+            )
+            return r.status_code, r.content, r.headers
+        except Exception as ex:
+            raise LogException("LogRequestError", str(ex))
+
+
+# 参与签名的请求头（小写）
+_SIGNED_HEADERS = frozenset(("content-type", "content-md5", "host"))
+
+_SIGN_TPL = (
+    "q-sign-algorithm=sha1&q-ak={ak}&q-sign-time={sign_time}"
+    "&q-key-time={sign_time}&q-header-list={headers}"
+    "&q-url-param-list={params}&q-signature={sign}"
+)
+
+
+class _Signer:
+    """CLS 请求签名，结果与 ``tencentcloud.log.auth.signature`` 一致。
+
+    SecretKey 不变，HMAC 以它为密钥初始化后的状态只计算一次，每次签名
+    ``copy()`` 一份再 update；由签名时间派生的 sign_key 同理按秒缓存，
+    同一秒内的请求共用。
+    """
+
+    def __init__(self, access_key_id: str, access_key_secret: str, expire: int):
+        """
+        Args:
+            access_key_id:     SecretID
+            access_key_secret: SecretKey
+            expire:            签名有效期（秒）
+        """
+        self._access_key_id = access_key_id
+        self._expire = expire
+        self._secret_mac = hmac.new(
+            access_key_secret.encode("utf-8"), digestmod=hashlib.sha1,
+        )
+        # (签名起始秒, sign_time, 以 sign_key 初始化的 HMAC)；整体替换，无需加锁
+        self._key_cache: tuple[int, str, hmac.HMAC] = (-1, "", self._secret_mac)
+
+    def sign(self, method: str, path: str, params: dict, headers: dict) -> str:
+        """计算 Authorization 请求头。"""
+        signed_headers = sorted(
+            (k.lower(), v) for k, v in headers.items()
+            if k.lower() in _SIGNED_HEADERS
+        )
+        sorted_params = sorted((k.lower(), v) for k, v in params.items())
+        format_str = "{}\n{}\n{}\n{}\n".format(
+            method.lower(),
+            path,
+            "&".join(f"{k}={quote_plus(v)}" for k, v in sorted_params),
+            "&".join(f"{k}={quote_plus(v)}" for k, v in signed_headers),
+        )
+
+        sign_time, key_mac = self._sign_key(int(time.time()))
+        str_to_sign = "sha1\n{}\n{}\n".format(
+            sign_time, hashlib.sha1(format_str.encode("utf-8")).hexdigest(),
+        )
+        mac = key_mac.copy()
+        mac.update(str_to_sign.encode("utf-8"))
+
+        return _SIGN_TPL.format(
+            ak=self._access_key_id,
+            sign_time=sign_time,
+            headers=";".join(k for k, _ in signed_headers),
+            params=";".join(k for k, _ in sorted_params),
+            sign=mac.hexdigest(),
+        )
+
+    def _sign_key(self, now: int) -> tuple[str, hmac.HMAC]:
+        """返回 now 对应的 sign_time 与以 sign_key 初始化的 HMAC（按秒缓存）。"""
+        cached_sec, sign_time, key_mac = self._key_cache
+        if cached_sec == now:
+            return sign_time, key_mac
+
+        sign_time = f"{now - 60};{now + self._expire}"
+        mac = self._secret_mac.copy()
+        mac.update(sign_time.encode("utf-8"))
+        key_mac = hmac.new(
+            mac.hexdigest().encode("utf-8"), digestmod=hashlib.sha1,
+        )
+        self._key_cache = (now, sign_time, key_mac)
+        return sign_time, key_mac
@@ -10,12 +10,17 @@ import socket
 from dataclasses import dataclass, field
 from typing import Optional
 
+# 支持的上报压缩方式（"" 表示不压缩）
+_COMPRESS_TYPES = ("lz4", "")
+# 缓冲区满时的丢弃策略："drop_new" 丢弃新写入的日志，"drop_old" 丢弃最旧的日志
+_OVERFLOW_POLICIES = ("drop_new", "drop_old")
+
 
 @dataclass
 class CLSConfig:
     """CLS 日志上报配置。
 
-    必填字段:
+    必填字段（sidecar 模式下由 agent 负责上报，可不填）:
         topic_id:   CLS 日志主题 ID
         host:       CLS 上报域名，如 "ap-guangzhou.cls.tencentcs.com"
         secret_id:  腾讯云 SecretID
@@ -35,13 +40,17 @@ class CLSConfig:
     total_size_bytes: int = 104857600         # 缓存上限 100MB
     max_send_workers: int = 50                # 最大并发发送线程数
     max_block_sec: int = 0                    # 缓冲区满时阻塞秒数（0=非阻塞，丢弃）
+    overflow_policy: str = "drop_new"         # 缓冲区满且不再等待时的丢弃策略："drop_new" 或 "drop_old"
     max_batch_size: int = 5242880             # 批量大小阈值 5MB
     max_batch_count: int = 4096               # 批量条数阈值
     linger_ms: int = 2000                     # 批量等待时间（毫秒）
     retries: int = 10                         # 失败重试次数
     base_retry_backoff_ms: int = 100          # 首次重试退避（毫秒）
     max_retry_backoff_ms: int = 50000         # 最大重试退避（毫秒）
+    max_retry_duration_ms: int = 300000       # 单个批次重试总时长上限（毫秒）
     field_map: Optional[dict[str, str]] = None  # 字段名映射
+    compress: str = "lz4"                     # 上报压缩方式："lz4" 或 ""（不压缩）
+    sidecar_path: Optional[str] = None        # 本机 sidecar agent 的 Unix socket 路径，设置后由 agent 上报
 
     def __post_init__(self):
         if not self.source:
@@ -50,16 +59,27 @@ class CLSConfig:
     def validate(self) -> None:
         """校验必填字段。"""
         missing = []
-        if not self.topic_id:
-            missing.append("topic_id")
-        if not self.host:
-            missing.append("host")
-        if not self.secret_id:
-            missing.append("secret_id")
-        if not self.secret_key:
-            missing.append("secret_key")
+        if not self.sidecar_path:
+            if not self.topic_id:
+                missing.append("topic_id")
+            if not self.host:
+                missing.append("host")
+            if not self.secret_id:
+                missing.append("secret_id")
+            if not self.secret_key:
+                missing.append("secret_key")
         if missing:
             raise ValueError(f"CLS 配置缺少必填字段: {', '.join(missing)}")
+        if self.compress not in _COMPRESS_TYPES:
+            raise ValueError(
+                f"CLS 配置 compress 不支持: {self.compress!r}，"
+                f"可选值: {', '.join(repr(c) for c in _COMPRESS_TYPES)}"
+            )
+        if self.overflow_policy not in _OVERFLOW_POLICIES:
+            raise ValueError(
+                f"CLS 配置 overflow_policy 不支持: {self.overflow_policy!r}，"
+                f"可选值: {', '.join(repr(p) for p in _OVERFLOW_POLICIES)}"
+            )
 
     # ------------------------------------------------------------------ #
     # 工厂方法
@@ -71,7 +71,14 @@ class CLSHandler(logging.Handler):
         super().__init__(level)
         self._config = config
         self._time_format = time_format
+        # 按秒缓存格式化后的时间字符串，同一秒内的日志复用一次 strftime 结果。
+        # 含 %f（微秒）的格式每条日志都不同，不缓存，仍走 datetime.strftime。
+        # emit 在 handler 锁内执行，无需额外同步。
+        self._subsecond_format = "%f" in time_format.replace("%%", "")
+        self._ts_cache_sec = -1
+        self._ts_cache_str = ""
         self._producer = AsyncProducer(config)
+        self._send = self._producer.send    # emit 热路径上直接调用绑定方法
         self._context_fields: dict[str, str] = {}
 
     def set_context_fields(self, **kwargs) -> None:
@@ -94,7 +101,7 @@ class CLSHandler(logging.Handler):
         try:
             fields = self._record_to_fields(record)
             timestamp_us = int(record.created * 1_000_000)
-            self._producer.send(fields, timestamp_us=timestamp_us)
+            self._send(fields, timestamp_us)
         except Exception:
             self.handleError(record)
 
@@ -111,8 +118,15 @@ class CLSHandler(logging.Handler):
         # 格式化消息
         msg = self.format(record)
 
-        # 格式化时间
-        log_time = datetime.fromtimestamp(record.created).strftime(self._time_format)
+        # 格式化时间（同一秒内复用缓存）
+        if self._subsecond_format:
+            log_time = datetime.fromtimestamp(record.created).strftime(self._time_format)
+        else:
+            sec = int(record.created)
+            if sec != self._ts_cache_sec:
+                self._ts_cache_str = datetime.fromtimestamp(sec).strftime(self._time_format)
+                self._ts_cache_sec = sec
+            log_time = self._ts_cache_str
 
         fields: dict[str, str] = {
             self.TIME_KEY: log_time,
@@ -133,10 +147,14 @@ class CLSHandler(logging.Handler):
             tb = "".join(traceback.format_exception(*record.exc_info))
             fields[self.STACKTRACE_KEY] = tb
 
-        # 提取 extra 字段（用户通过 extra={} 传入的自定义字段）
-        for key, value in record.__dict__.items():
-            if key not in self._BUILTIN_ATTRS and key not in fields:
-                fields[key] = str(value)
+        # 提取 extra 字段（用户通过 extra={} 传入的自定义字段）。
+        # 集合差集在 C 层完成，没有 extra 时不进入 Python 循环。
+        record_dict = record.__dict__
+        extra_keys = record_dict.keys() - self._BUILTIN_ATTRS
+        if extra_keys:
+            extra_keys -= fields.keys()
+            for key in extra_keys:
+                fields[key] = str(record_dict[key])
 
         # 应用 field_map（与 trpc-go-log-cls 的 GetReportCLSField 对应）
         if self._config.field_map:
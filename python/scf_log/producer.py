@@ -2,66 +2,48 @@
 异步批量日志生产者。
 
 参考 Go CLS SDK 的 AsyncProducerClient 设计，在 Python 侧实现：
+  - 日志在 send() 调用方线程中预先序列化为 protobuf 字节，缓冲区只保存这些字节
   - 后台 daemon 线程定时 flush
-  - 基于条数 / 大小 / 超时三重阈值触发批量发送
-  - 发送失败时指数退避重试
+  - 基于条数 / 大小 / 超时三重阈值触发批量发送，超时按填充速率自适应缩短
+  - 发送线程池并发上报（max_send_workers），flush 线程不阻塞在网络 I/O 上
+  - 发送失败时指数退避重试（full jitter + 单批次重试总时长上限）
   - 内存缓冲区大小限制
   - 优雅关闭（flush 剩余日志）
+  - 可选 sidecar 模式：逐条交给本机 agent 上报，进程内不做批量与网络 I/O
 """
 
 from __future__ import annotations
 
 import atexit
+import itertools
 import logging
+import random
 import threading
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Optional
 
-from tencentcloud.log.logclient import LogClient
-from tencentcloud.log.cls_pb2 import LogGroupList
 from tencentcloud.log.logexception import LogException
 
+from ._wire import (
+    TAG_LOG_GROUP_LIST, TAG_SOURCE, KeyCache, encode_varint, serialize_log,
+)
+from .client import CLSClient
 from .config import CLSConfig
+from .sidecar import SidecarSender
 
 _logger = logging.getLogger("scf_log.producer")
 
+# 估算的单条日志平均字节数，用于按 total_size_bytes 确定环形缓冲区的初始槽位数
+_AVG_ENTRY_SIZE = 512
 
-# ============================================================================
-# 内部数据结构
-# ============================================================================
-
-
-@dataclass
-class LogEntry:
-    """单条日志条目。"""
-
-    timestamp_us: int                   # 微秒时间戳
-    fields: dict[str, str]              # key-value 日志内容
-    size: int = 0                       # 估算字节大小
-
-    def __post_init__(self):
-        if self.size == 0:
-            self.size = sum(
-                len(k) + len(v) for k, v in self.fields.items()
-            )
-
-
-@dataclass
-class _Batch:
-    """一个待发送的日志批次。"""
+# 自适应 linger：填充速率 EWMA 的平滑系数，以及按预测提前 flush 时的最短等待
+_FILL_RATE_ALPHA = 0.3
+_MIN_FLUSH_WAIT_SEC = 0.01
 
-    entries: list[LogEntry] = field(default_factory=list)
-    total_size: int = 0
-    count: int = 0
-
-    def add(self, entry: LogEntry) -> None:
-        self.entries.append(entry)
-        self.total_size += entry.size
-        self.count += 1
-
-    def is_empty(self) -> bool:
-        return self.count == 0
+# 可重试的 CLS 错误码（与 SDK 内置重试的判定一致）
+_RETRYABLE_CODES = frozenset(("InternalError", "Timeout", "SpeedQuotaExceed"))
 
 
 # ============================================================================
@@ -70,41 +52,52 @@ class _Batch:
 
 
 class ProducerStats:
-    """生产者运行统计（线程安全）。"""
+    """生产者运行统计（线程安全）。
+
+    计数器基于 itertools.count：next() 在 C 层完成且受 GIL 保护，
+    incr_* 无需加锁，只有 snapshot() 读取时加锁。
+    """
 
     def __init__(self):
         self._lock = threading.Lock()
-        self.send_success: int = 0
-        self.send_fail: int = 0
-        self.log_count: int = 0
-        self.drop_count: int = 0
+        self._success = itertools.count()
+        self._fail = itertools.count()
+        self._logs = itertools.count()
+        self._drop = itertools.count()
+        self._reads: int = 0                  # snapshot() 次数，每次读取会把各计数器推进 1
 
     def incr_success(self) -> None:
-        with self._lock:
-            self.send_success += 1
+        next(self._success)
 
     def incr_fail(self) -> None:
-        with self._lock:
-            self.send_fail += 1
+        next(self._fail)
 
     def incr_logs(self, n: int) -> None:
-        with self._lock:
-            self.log_count += n
+        _advance(self._logs, n)
 
     def incr_drop(self, n: int) -> None:
-        with self._lock:
-            self.drop_count += n
+        _advance(self._drop, n)
 
     def snapshot(self) -> dict:
         with self._lock:
+            reads = self._reads
+            self._reads = reads + 1
             return {
-                "send_success": self.send_success,
-                "send_fail": self.send_fail,
-                "log_count": self.log_count,
-                "drop_count": self.drop_count,
+                "send_success": next(self._success) - reads,
+                "send_fail": next(self._fail) - reads,
+                "log_count": next(self._logs) - reads,
+                "drop_count": next(self._drop) - reads,
             }
 
 
+def _advance(counter: itertools.count, n: int) -> None:
+    """将 itertools.count 推进 n 步（整个过程在 C 层完成）。"""
+    if n == 1:
+        next(counter)
+    else:
+        deque(itertools.islice(counter, n), maxlen=0)
+
+
 # ============================================================================
 # AsyncProducer
 # ============================================================================
@@ -125,27 +118,81 @@ class AsyncProducer:
         config.validate()
         self._config = config
         self._stats = ProducerStats()
+        self._closed = False
+
+        # 字段名编码缓存（已应用字段映射），在 send() 序列化时使用
+        self._keys = KeyCache((config.field_map or {}).get)
+        # 各批次相同的 LogGroup.source 字段，预先编码一次
+        source = config.source.encode("utf-8")
+        self._source_field = TAG_SOURCE + encode_varint(len(source)) + source
+
+        # sidecar 模式：日志逐条交给本机 agent，
+        # 进程内不需要缓冲区、flush 线程与 CLS 客户端
+        self._sidecar: Optional[SidecarSender] = None
+        if config.sidecar_path:
+            self._sidecar = SidecarSender(
+                config.sidecar_path, self._stats, config.max_block_sec,
+            )
+            return
 
         # CLS SDK 客户端
         endpoint = config.host
         if not endpoint.startswith("http"):
             endpoint = "https://" + endpoint
-        self._client = LogClient(
+        self._client = CLSClient(
             endpoint,
             config.secret_id,
             config.secret_key,
             source=config.source,
+            pool_size=config.max_send_workers,
+            compress=config.compress,
         )
 
-        # 缓冲区
-        self._buffer: list[LogEntry] = []
+        # 发送线程池：flush 线程只负责组批与提交，HTTP 请求在线程池中并发执行；
+        # 信号量限制在途分块数，保证内存占用有界
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.max_send_workers,
+            thread_name_prefix="scf-cls-send",
+        )
+        self._inflight = threading.BoundedSemaphore(config.max_send_workers)
+        # 发送线程用到的配置项，同样缓存为实例属性
+        self._topic_id = config.topic_id
+        self._retries = config.retries
+        self._max_retry_duration_sec = config.max_retry_duration_ms / 1000.0
+        self._base_retry_backoff_ms = config.base_retry_backoff_ms
+        self._max_retry_backoff_ms = config.max_retry_backoff_ms
+
+        # 缓冲区：两块预分配的环形缓冲区（双缓冲），
+        # send() 写入 _slots，flush 时与 _standby 交换；head/tail/count 由 _lock 保护。
+        # 每个槽位直接保存一条日志序列化后的字节（带 LogGroup.logs 的 tag 与长度前缀，
+        # 时间戳已编码在内），多条直接拼接即为合法的 LogGroup 片段；不再为每条日志
+        # 维护单独的条目对象。
+        # 槽位数只是初始容量：日志比预估的小、槽位先于字节数用尽时 _slots 成倍扩容，
+        # 缓冲区的上限始终是 total_size_bytes。环的长度以各自列表的 len() 为准。
+        capacity = max(
+            config.max_batch_count * 2,
+            config.total_size_bytes // _AVG_ENTRY_SIZE,
+        )
+        # send() / flush 线程热路径上用到的配置项，缓存为实例属性，省去 self._config.xxx 的属性链查找
+        self._max_buffer_bytes = config.total_size_bytes
+        self._max_batch_size = config.max_batch_size
+        self._max_batch_count = config.max_batch_count
+        self._max_block_sec = config.max_block_sec
+        self._drop_oldest = config.overflow_policy == "drop_old"
+        self._slots: list[Optional[bytes]] = [None] * capacity
+        self._standby: list[Optional[bytes]] = [None] * capacity
+        self._head: int = 0
+        self._tail: int = 0
+        self._count: int = 0
         self._buffer_size: int = 0            # 当前缓冲字节数
+        self._first_ts: float = 0.0           # 本批第一条日志写入时刻（monotonic）
+        self._fill_rate: float = 0.0          # 缓冲区填充速率 EWMA（字节/秒）
         self._lock = threading.Lock()
-        self._not_empty = threading.Condition(self._lock)
-        self._not_full = threading.Condition(self._lock)
+        self._flush_event = threading.Event()   # 达到批量阈值 / 关闭时唤醒 flush 线程
+        self._not_full = threading.Event()      # 缓冲区腾出空间时唤醒阻塞的 send()
+        self._flush_lock = threading.Lock()     # 串行化 drain + 发送，保证 _standby 用完才再次交换
 
         # 控制
-        self._closed = False
         self._flush_thread = threading.Thread(
             target=self._flush_loop,
             name="scf-cls-flush",
@@ -168,7 +215,7 @@ class AsyncProducer:
         """发送一条日志。
 
         Args:
-            log_fields:   日志字段 key-value
+            log_fields:   日志字段 key-value，key / value 须为 str（调用方负责转换）
             timestamp_us: 微秒时间戳，None 则使用当前时间
 
         Returns:
@@ -180,45 +227,98 @@ class AsyncProducer:
         if timestamp_us is None:
             timestamp_us = int(time.time() * 1_000_000)
 
-        entry = LogEntry(timestamp_us=timestamp_us, fields=log_fields)
-
-        with self._not_full:
-            # 检查缓冲区是否已满
-            if self._buffer_size + entry.size > self._config.total_size_bytes:
-                if self._config.max_block_sec <= 0:
-                    # 非阻塞：丢弃
-                    self._stats.incr_drop(1)
-                    _logger.warning(
-                        "CLS 日志缓冲区已满，丢弃日志 (buffer_size=%d, limit=%d)",
-                        self._buffer_size, self._config.total_size_bytes,
-                    )
-                    return False
-                else:
-                    # 阻塞等待
-                    deadline = time.monotonic() + self._config.max_block_sec
-                    while self._buffer_size + entry.size > self._config.total_size_bytes:
-                        remaining = deadline - time.monotonic()
-                        if remaining <= 0:
-                            self._stats.incr_drop(1)
-                            _logger.warning("CLS 日志缓冲区等待超时，丢弃日志")
-                            return False
-                        self._not_full.wait(timeout=remaining)
-
-            self._buffer.append(entry)
-            self._buffer_size += entry.size
-
-            # 如果达到批量阈值，立即通知 flush 线程
-            if (self._buffer_size >= self._config.max_batch_size
-                    or len(self._buffer) >= self._config.max_batch_count):
-                self._not_empty.notify()
+        # 在调用方线程中完成序列化，flush 线程只负责拼接与发送
+        entry = serialize_log(timestamp_us, log_fields, self._keys)
+
+        if self._sidecar is not None:
+            # 单条日志 + source 即为完整的 LogGroup，统计由 sidecar 负责
+            return self._sidecar.send(entry, self._source_field)
+
+        entry_size = len(entry)
+        max_buffer_bytes = self._max_buffer_bytes
+        deadline: Optional[float] = None
+        evict = False       # 不再等待，按 drop_old 策略淘汰最旧的日志腾出空间
+        evicted = 0
+
+        while True:
+            with self._lock:
+                if evict:
+                    evicted = self._evict_oldest_locked(entry_size)
+                buffer_size = self._buffer_size
+                # 检查缓冲区是否已满（字节数；槽位不够时扩容）
+                if buffer_size + entry_size <= max_buffer_bytes:
+                    slots = self._slots
+                    count = self._count
+                    if count == len(slots):
+                        slots = self._grow_locked()
+                    tail = self._tail
+                    slots[tail] = entry
+                    self._tail = (tail + 1) % len(slots)
+                    self._count = count = count + 1
+                    self._buffer_size = buffer_size + entry_size
+                    if count == 1:
+                        self._first_ts = time.monotonic()
+                    break
+                self._not_full.clear()
+
+            if evict:
+                # 单条日志超过缓冲区上限，淘汰旧日志也放不下
+                self._stats.incr_drop(evicted + 1)
+                _logger.warning(
+                    "CLS 日志超过缓冲区上限，丢弃日志 (size=%d, limit=%d)",
+                    entry_size, max_buffer_bytes,
+                )
+                return False
+
+            if self._max_block_sec <= 0:
+                if self._drop_oldest:
+                    evict = True
+                    continue
+                # 非阻塞：丢弃
+                self._stats.incr_drop(1)
+                _logger.warning(
+                    "CLS 日志缓冲区已满，丢弃日志 (buffer_size=%d, limit=%d)",
+                    buffer_size, max_buffer_bytes,
+                )
+                return False
+
+            # 阻塞等待
+            if deadline is None:
+                deadline = time.monotonic() + self._max_block_sec
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if self._drop_oldest:
+                    evict = True
+                    continue
+                self._stats.incr_drop(1)
+                _logger.warning("CLS 日志缓冲区等待超时，丢弃日志")
+                return False
+            self._not_full.wait(timeout=remaining)
+
+        if evicted:
+            self._stats.incr_drop(evicted)
+            _logger.warning(
+                "CLS 日志缓冲区已满，丢弃最旧的 %d 条日志 (limit=%d)",
+                evicted, max_buffer_bytes,
+            )
+
+        # 写入第一条（flush 线程开始计时）或刚跨过批量阈值时通知 flush 线程，
+        # 其余情况不触碰 Event
+        if (count == 1
+                or count == self._max_batch_count
+                or buffer_size < self._max_batch_size <= buffer_size + entry_size):
+            self._flush_event.set()
 
         return True
 
     def flush(self) -> None:
-        """立即发送缓冲区中的所有日志。"""
-        entries = self._drain_buffer()
-        if entries:
-            self._send_batch(entries)
+        """立即发送缓冲区中的所有日志，并等待本次提交的分块发送完成。"""
+        if self._sidecar is not None:
+            return
+        with self._flush_lock:
+            futures = self._flush_locked()
+        if futures:
+            wait(futures)
 
     def close(self, timeout_ms: int = 60000) -> None:
         """优雅关闭：flush 剩余日志并等待发送完成。
@@ -230,15 +330,19 @@ class AsyncProducer:
             return
         self._closed = True
 
-        # 唤醒 flush 线程使其退出
-        with self._not_empty:
-            self._not_empty.notify()
+        if self._sidecar is not None:
+            self._sidecar.close()
+        else:
+            # 唤醒 flush 线程使其退出
+            self._flush_event.set()
 
-        # 等待 flush 线程结束
-        self._flush_thread.join(timeout=timeout_ms / 1000)
+            # 等待 flush 线程结束
+            self._flush_thread.join(timeout=timeout_ms / 1000)
 
-        # 发送剩余日志
-        self.flush()
+            # 发送剩余日志，并等待所有在途分块完成
+            self.flush()
+            self._executor.shutdown(wait=True)
+            self._client.close()
 
         stats = self._stats.snapshot()
         _logger.info(
@@ -259,81 +363,260 @@ class AsyncProducer:
     def _flush_loop(self) -> None:
         """后台 flush 线程主循环。"""
         linger_sec = self._config.linger_ms / 1000.0
+        flush_event = self._flush_event
+        next_flush_wait = self._next_flush_wait
+        flush_lock = self._flush_lock
+        flush_locked = self._flush_locked
 
         while not self._closed:
-            with self._not_empty:
-                # 等待至超时或被通知
-                self._not_empty.wait(timeout=linger_sec)
+            timeout = next_flush_wait(linger_sec)
+            if timeout is None:
+                # 缓冲区为空：不定时唤醒，等待第一条日志写入或关闭
+                flush_event.wait()
+                flush_event.clear()
+                continue
+
+            if timeout > 0:
+                # 等待至超时或被通知（达到批量阈值 / 关闭）
+                flush_event.wait(timeout=timeout)
+                flush_event.clear()
+
+            # 取出缓冲区并发送；异常不能让 flush 线程退出，否则之后的日志都不会再发送
+            try:
+                with flush_lock:
+                    flush_locked()
+            except Exception:
+                _logger.exception("CLS flush 线程发送异常")
 
-            # 取出缓冲区
-            entries = self._drain_buffer()
-            if entries:
-                self._send_batch(entries)
+    def _next_flush_wait(self, linger_sec: float) -> Optional[float]:
+        """计算 flush 线程下一次的等待秒数。
 
-    def _drain_buffer(self) -> list[LogEntry]:
-        """取出并清空缓冲区，返回所有待发送日志。"""
+        从本批第一条日志写入起最多等待 linger_sec；若按当前填充速率预计更早
+        达到 max_batch_size，则提前到预计时刻。
+
+        Returns:
+            None 表示缓冲区为空；<= 0 表示应立即 flush。
+        """
         with self._lock:
-            if not self._buffer:
-                return []
-            entries = self._buffer
-            self._buffer = []
+            count = self._count
+            buffer_size = self._buffer_size
+            first_ts = self._first_ts
+        if not count:
+            return None
+
+        max_batch_size = self._max_batch_size
+        if count >= self._max_batch_count or buffer_size >= max_batch_size:
+            return 0.0
+
+        timeout = linger_sec - (time.monotonic() - first_ts)
+        rate = self._fill_rate
+        if rate > 0:
+            time_to_full = (max_batch_size - buffer_size) / rate
+            timeout = min(timeout, max(time_to_full, _MIN_FLUSH_WAIT_SEC))
+        return timeout
+
+    def _flush_locked(self) -> list[Future]:
+        """取出缓冲区并提交发送，调用方须持有 _flush_lock。
+
+        Returns:
+            本次提交的各分块的 Future
+        """
+        slots, head, count = self._drain_buffer()
+        if not count:
+            return []
+        try:
+            return self._send_batch(slots, head, count)
+        finally:
+            # 清空已发送的备用缓冲区，供下一次交换复用
+            capacity = len(slots)
+            end = head + count
+            if end <= capacity:
+                slots[head:end] = itertools.repeat(None, count)
+            else:
+                slots[head:] = itertools.repeat(None, capacity - head)
+                slots[:end - capacity] = itertools.repeat(None, end - capacity)
+
+    def _grow_locked(self) -> list[Optional[bytes]]:
+        """已满的 _slots 扩容为两倍，调用方须持有 _lock。
+
+        环展开为从 0 开始的顺序排列，返回新的 _slots。
+        """
+        slots = self._slots
+        capacity = len(slots)
+        head = self._head
+        grown = slots[head:] + slots[:head]
+        grown.extend(itertools.repeat(None, capacity))
+        self._slots = grown
+        self._head = 0
+        self._tail = capacity
+        return grown
+
+    def _evict_oldest_locked(self, entry_size: int) -> int:
+        """从环形缓冲区头部淘汰日志，直到能写入 entry_size 字节的新日志，调用方须持有 _lock。
+
+        单条日志超过缓冲区上限时不淘汰。
+
+        Returns:
+            淘汰的条数
+        """
+        max_buffer_bytes = self._max_buffer_bytes
+        if entry_size > max_buffer_bytes:
+            return 0
+        slots = self._slots
+        capacity = len(slots)
+        head = self._head
+        count = self._count
+        buffer_size = self._buffer_size
+        evicted = 0
+        while count and buffer_size + entry_size > max_buffer_bytes:
+            buffer_size -= len(slots[head])
+            slots[head] = None
+            head = (head + 1) % capacity
+            count -= 1
+            evicted += 1
+        self._head = head
+        self._count = count
+        self._buffer_size = buffer_size
+        return evicted
+
+    def _drain_buffer(self) -> tuple[list[Optional[bytes]], int, int]:
+        """交换前后台缓冲区，返回 (slots, head, count)。
+
+        锁内只做指针交换，不复制条目、不分配新列表。
+        """
+        # _slots 扩容过时，备用缓冲区在锁外补齐到相同长度，避免交换后再次逐步扩容
+        # （备用缓冲区只在持有 _flush_lock 时使用，这里可以安全修改）
+        standby = self._standby
+        missing = len(self._slots) - len(standby)
+        if missing > 0:
+            standby.extend(itertools.repeat(None, missing))
+
+        with self._lock:
+            count = self._count
+            if not count:
+                return self._standby, 0, 0
+            slots = self._slots
+            head = self._head
+            self._slots = self._standby
+            self._standby = slots
+            self._head = self._tail = self._count = 0
+
+            # 更新填充速率 EWMA（本批字节数 / 从第一条写入到现在的时长）
+            elapsed = time.monotonic() - self._first_ts
+            if elapsed > 0:
+                rate = self._buffer_size / elapsed
+                if self._fill_rate > 0:
+                    rate = (_FILL_RATE_ALPHA * rate
+                            + (1 - _FILL_RATE_ALPHA) * self._fill_rate)
+                self._fill_rate = rate
             self._buffer_size = 0
 
-        # 通知等待的 send() 线程
-        with self._not_full:
-            self._not_full.notify_all()
+            # 通知等待的 send() 线程
+            self._not_full.set()
 
-        return entries
+        return slots, head, count
 
-    def _send_batch(self, entries: list[LogEntry]) -> None:
-        """将一批日志发送到 CLS，失败时指数退避重试。"""
-        # 按 max_batch_count 分块发送
-        for i in range(0, len(entries), self._config.max_batch_count):
-            chunk = entries[i : i + self._config.max_batch_count]
-            self._send_chunk(chunk)
+    def _send_batch(
+        self,
+        slots: list[Optional[bytes]],
+        head: int,
+        count: int,
+    ) -> list[Future]:
+        """将环形缓冲区 [head, head+count) 中的日志分块提交到发送线程池。
+
+        在途分块数达到 max_send_workers 时阻塞，直到有分块发送完成。
+        线程池已关闭（解释器退出中）时在当前线程同步发送，不返回 Future。
+        """
+        capacity = len(slots)
+        batch_count = self._max_batch_count
+        futures: list[Future] = []
 
-    def _send_chunk(self, entries: list[LogEntry]) -> None:
-        """发送一个分块。"""
-        log_group_list = self._build_log_group_list(entries)
+        # 按 max_batch_count 分块发送
+        for offset in range(0, count, batch_count):
+            start = (head + offset) % capacity
+            end = start + min(batch_count, count - offset)
+            if end <= capacity:
+                chunk = slots[start:end]
+            else:
+                # 跨越环尾，分两段取出
+                chunk = slots[start:] + slots[:end - capacity]
+
+            self._inflight.acquire()
+            try:
+                future = self._executor.submit(self._send_chunk, chunk)
+            except RuntimeError:
+                # 线程池已关闭：解释器退出时线程池的 shutdown 钩子先于 atexit 执行，
+                # 之后的 submit 都会失败，改为在当前线程直接发送，避免丢失日志
+                self._inflight.release()
+                self._send_chunk(chunk)
+                continue
+            except BaseException:
+                self._inflight.release()
+                raise
+            future.add_done_callback(self._release_inflight)
+            futures.append(future)
+
+        return futures
+
+    def _release_inflight(self, _future: Future) -> None:
+        """分块发送完成回调，释放在途名额。"""
+        self._inflight.release()
+
+    def _send_chunk(self, entries: list[bytes]) -> None:
+        """发送一个分块。
+
+        字节数已在 send() 中累计，这里不再重新计算。
+        """
+        body = self._build_log_group_list(entries)
 
-        backoff_ms = self._config.base_retry_backoff_ms
+        retries = self._retries
+        topic_id = self._topic_id
+        put_log_bytes = self._client.put_log_bytes
+        deadline = time.monotonic() + self._max_retry_duration_sec
         last_err: Optional[Exception] = None
 
-        for attempt in range(self._config.retries + 1):
+        for attempt in range(retries + 1):
             try:
-                self._client.put_log_raw(self._config.topic_id, log_group_list)
+                put_log_bytes(topic_id, body)
                 self._stats.incr_success()
                 self._stats.incr_logs(len(entries))
                 return
             except LogException as e:
                 last_err = e
-                error_code = e.get_error_code() if hasattr(e, "get_error_code") else ""
-                # 可重试的错误
-                retryable = error_code in (
-                    "InternalError", "Timeout", "SpeedQuotaExceed",
-                ) or (hasattr(e, "resp_status") and e.resp_status >= 500)
+                error_code = e.get_error_code()
+                # 可重试的错误（与 SDK 内置重试的判定一致，含连接层错误）
+                retryable = (
+                    error_code in _RETRYABLE_CODES
+                    or (getattr(e, "resp_status", None) or 0) >= 500
+                    or (error_code == "LogRequestError"
+                        and "httpconnectionpool" in str(e).lower())
+                )
 
-                if not retryable or attempt >= self._config.retries:
+                if not retryable or attempt >= retries:
+                    break
+                delay = self._backoff_delay(attempt, deadline)
+                if delay is None:
                     break
 
                 _logger.warning(
                     "CLS 发送失败，重试 %d/%d: code=%s, msg=%s",
-                    attempt + 1, self._config.retries,
+                    attempt + 1, retries,
                     error_code, str(e),
                 )
-                time.sleep(backoff_ms / 1000.0)
-                backoff_ms = min(backoff_ms * 2, self._config.max_retry_backoff_ms)
+                time.sleep(delay)
 
             except Exception as e:
                 last_err = e
-                if attempt >= self._config.retries:
+                if attempt >= retries:
+                    break
+                delay = self._backoff_delay(attempt, deadline)
+                if delay is None:
                     break
                 _logger.warning(
                     "CLS 发送异常，重试 %d/%d: %s",
-                    attempt + 1, self._config.retries, e,
+                    attempt + 1, retries, e,
                 )
-                time.sleep(backoff_ms / 1000.0)
-                backoff_ms = min(backoff_ms * 2, self._config.max_retry_backoff_ms)
+                time.sleep(delay)
 
         # 全部重试失败
         self._stats.incr_fail()
@@ -342,29 +625,28 @@ class AsyncProducer:
             len(entries), last_err,
         )
 
-    def _build_log_group_list(self, entries: list[LogEntry]) -> LogGroupList:
-        """构建 CLS protobuf LogGroupList。"""
-        log_group_list = LogGroupList()
-        log_group = log_group_list.logGroupList.add()
-        log_group.source = self._config.source
-
-        field_map = self._config.field_map
-
-        for entry in entries:
-            log = log_group.logs.add()
-            log.time = entry.timestamp_us
+    def _backoff_delay(self, attempt: int, deadline: float) -> Optional[float]:
+        """计算第 attempt 次失败后的退避秒数。
 
-            for key, value in entry.fields.items():
-                # 应用字段映射
-                report_key = key
-                if field_map and key in field_map:
-                    report_key = field_map[key]
+        退避上限为 min(max_retry_backoff_ms, base_retry_backoff_ms * 2^attempt)，
+        实际值在 [0, 上限) 内均匀随机（full jitter），避免多个实例同步重试。
 
-                content = log.contents.add()
-                content.key = report_key
-                content.value = str(value)
-
-        return log_group_list
+        Returns:
+            None 表示退避后会超出本分块的重试截止时间，应放弃重试。
+        """
+        cap_ms = min(
+            self._max_retry_backoff_ms,
+            self._base_retry_backoff_ms * (2 ** attempt),
+        )
+        delay = random.uniform(0, cap_ms) / 1000.0
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def _build_log_group_list(self, entries: list[bytes]) -> bytes:
+        """拼接预序列化的日志，构建 LogGroupList 的 wire bytes。"""
+        log_group = b"".join(itertools.chain(entries, (self._source_field,)))
+        return TAG_LOG_GROUP_LIST + encode_varint(len(log_group)) + log_group
 
     def _atexit_flush(self) -> None:
         """atexit 回调，确保程序退出时发送残留日志。"""
@@ -0,0 +1,247 @@
+"""
+sidecar 模式的日志发送。
+
+多进程部署时每个进程各自维护缓冲区、flush 线程、HTTP 连接与重试状态，
+资源开销随进程数放大。sidecar 模式下进程只把序列化好的日志写入本机
+agent 监听的 Unix datagram socket，批量、重试、鉴权与上报都由 agent 完成。
+
+帧格式（一个 datagram 包含一个或多个帧，顺序排列）::
+
+    +----------------------+---------------------------------------+
+    | length: uint32 (LE)  | body: 序列化后的 cls.LogGroup（length 字节） |
+    +----------------------+---------------------------------------+
+
+body 是只包含一条日志的 LogGroup（logs + source），agent 可直接
+合并到自己的批次中。
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import select
+import socket
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .producer import ProducerStats
+
+_logger = logging.getLogger("scf_log.sidecar")
+
+_FRAME_HEADER = struct.Struct("<I")
+
+# 单个 datagram 最多合并的帧数与字节数（iovec 数远低于 IOV_MAX，
+# 字节数低于 Unix datagram socket 默认的发送缓冲区）
+_MAX_FRAMES_PER_DATAGRAM = 128
+_MAX_DATAGRAM_BYTES = 64 * 1024
+
+
+class _Frame:
+    """一条待发送的帧及其发送结果。"""
+
+    __slots__ = ("iov", "size", "deadline", "result")
+
+    def __init__(self, iov: tuple[bytes, ...], size: int, deadline: float):
+        self.iov = iov
+        self.size = size
+        self.deadline = deadline            # 最晚发送时刻（monotonic）
+        self.result: Optional[bool] = None  # None 表示尚未发送
+
+
+class SidecarSender:
+    """通过 Unix datagram socket 把日志交给本机 sidecar agent。
+
+    每帧的 header 与 body 通过 sendmsg 的 iovec 一次系统调用发出，不做拼接拷贝。
+    多个线程同时提交时，没有线程在发送则由当前线程发送，否则把帧追加到待发送
+    列表并等待；发送线程每次只取走一次待发送列表（每个线程至多一帧），合并成
+    尽量少的 datagram 发出后交给下一个等待的线程，因此每次调用的工作量有界，
+    且返回时自己的帧已经发送或丢弃。
+
+    socket 为非阻塞模式：agent 未启动时直接丢弃；agent 接收队列已满时
+    每帧最多等待 max_block_sec（0 表示直接丢弃），不会无限阻塞调用 logging 的业务线程。
+    agent 重启后会在下一次发送时自动重连。
+
+    发送过程中的告警在交出发送权之后才输出；告警经 logging 回到本 sender
+    （如 root logger 上的 CLSHandler）时，同一线程内的重入调用直接丢弃。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stats: ProducerStats,
+        max_block_sec: float = 0,
+    ):
+        """
+        Args:
+            path:          agent 监听的 Unix datagram socket 路径
+            stats:         发送统计，每个 datagram 计一次 success，丢弃按条计入 drop
+            max_block_sec: agent 接收队列满时每帧的最长等待秒数（0=不等待，丢弃）
+        """
+        self._path = path
+        self._stats = stats
+        self._max_block_sec = max_block_sec
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._connected = False
+        self._reported = False              # 断连告警已输出，重连成功前不再重复
+        self._lock = threading.Lock()       # 保护 connect 状态
+
+        # 待发送的帧与发送权，由 _cond 保护
+        self._pending: list[_Frame] = []
+        self._sending = False               # 是否已有线程在发送
+        self._cond = threading.Condition(threading.Lock())
+        # 发送线程产生的告警 (msg, args)，仅持有发送权的线程读写
+        self._warnings: list[tuple[str, tuple]] = []
+        self._local = threading.local()     # active: 本线程是否正在 send() 中
+
+    def send(self, *parts: bytes) -> bool:
+        """发送一帧，body 为 parts 按顺序拼接。
+
+        Returns:
+            True 表示已发送，False 表示被丢弃
+        """
+        local = self._local
+        if getattr(local, "active", False):
+            # 本线程在 send() 中输出的告警又回到了这里，丢弃以免重入
+            self._stats.incr_drop(1)
+            return False
+        local.active = True
+        try:
+            ok, warnings = self._submit(parts)
+            for msg, args in warnings:
+                _logger.warning(msg, *args)
+            return ok
+        finally:
+            local.active = False
+
+    def close(self) -> None:
+        """关闭 socket。"""
+        self._sock.close()
+
+    def _submit(self, parts: tuple[bytes, ...]) -> tuple[bool, list[tuple[str, tuple]]]:
+        """提交一帧并等待发送结果。
+
+        Returns:
+            (是否已发送, 本线程作为发送线程时产生、待输出的告警)
+        """
+        body_size = sum(map(len, parts))
+        frame = _Frame(
+            (_FRAME_HEADER.pack(body_size), *parts),
+            _FRAME_HEADER.size + body_size,
+            time.monotonic() + self._max_block_sec,
+        )
+
+        with self._cond:
+            self._pending.append(frame)
+            # 其他线程正在发送：等待它发送本帧，或发送结束后由本线程接手
+            while self._sending:
+                self._cond.wait()
+                if frame.result is not None:
+                    return frame.result, []
+            self._sending = True
+            frames = self._pending
+            self._pending = []
+
+        try:
+            self._send_frames(frames)
+        finally:
+            with self._cond:
+                # 发送中途出错时，未发送的帧按丢弃处理，等待的线程不会接手已取走的帧
+                for f in frames:
+                    if f.result is None:
+                        f.result = False
+                warnings = self._warnings
+                self._warnings = []
+                self._sending = False
+                self._cond.notify_all()
+        return bool(frame.result), warnings
+
+    def _send_frames(self, frames: list[_Frame]) -> None:
+        """把 frames 合并成尽量少的 datagram 发送，并记录每帧的结果。"""
+        start = 0
+        iov: list[bytes] = []
+        size = 0
+        for i, frame in enumerate(frames):
+            if i > start and (i - start >= _MAX_FRAMES_PER_DATAGRAM
+                              or size + frame.size > _MAX_DATAGRAM_BYTES):
+                self._send_datagram(frames[start:i], iov)
+                start = i
+                iov = []
+                size = 0
+            iov.extend(frame.iov)
+            size += frame.size
+        self._send_datagram(frames[start:], iov)
+
+    def _send_datagram(self, frames: list[_Frame], iov: list[bytes]) -> None:
+        """发送一个 datagram，等待时长以其中最早提交的帧为准。"""
+        ok = self._sendmsg(iov, len(frames), frames[0].deadline)
+        for frame in frames:
+            frame.result = ok
+
+    def _sendmsg(self, iov: list[bytes], count: int, deadline: float) -> bool:
+        """用一次 sendmsg 发送 count 帧，失败时按条计入丢弃。"""
+        reconnected = False
+
+        while self._connected or self._connect():
+            try:
+                self._sock.sendmsg(iov)
+                self._stats.incr_success()
+                self._stats.incr_logs(count)
+                return True
+            except BlockingIOError:
+                # agent 接收队列已满：在 deadline 前等待 socket 可写
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._warn(
+                        "CLS sidecar 接收队列已满，丢弃 %d 条日志 (path=%s)",
+                        count, self._path,
+                    )
+                    break
+                select.select((), (self._sock,), (), remaining)
+            except OSError as e:
+                if e.errno == errno.EMSGSIZE:
+                    self._warn(
+                        "CLS sidecar datagram 过大，丢弃 %d 条日志: %s", count, e,
+                    )
+                    break
+                self._disconnected(e)
+                # 连接失效（如 agent 重启）时立即重连再发一次
+                if reconnected:
+                    break
+                reconnected = True
+
+        self._stats.incr_drop(count)
+        return False
+
+    def _connect(self) -> bool:
+        """连接 agent socket，失败时返回 False。"""
+        with self._lock:
+            if self._connected:
+                return True
+            try:
+                self._sock.connect(self._path)
+            except OSError as e:
+                err = e
+            else:
+                self._connected = True
+                self._reported = False
+                return True
+        self._disconnected(err)
+        return False
+
+    def _disconnected(self, err: OSError) -> None:
+        """标记为未连接，并在本轮断连中只告警一次。"""
+        self._connected = False
+        if not self._reported:
+            self._reported = True
+            self._warn(
+                "CLS sidecar 不可用，日志将被丢弃直到重新连接 (path=%s): %s",
+                self._path, err,
+            )
+
+    def _warn(self, msg: str, *args) -> None:
+        """记录告警，由发送线程交出发送权后输出。"""
+        self._warnings.append((msg, args))